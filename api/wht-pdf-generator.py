@@ -3,11 +3,15 @@
 # GOAL: Generate Professional Diagnostic Report PDF
 # =========================================================================
 
+import copy
 import json
 import base64
 from datetime import datetime, timezone
+from functools import partial
+from xml.sax.saxutils import escape
 from http.server import BaseHTTPRequestHandler
 from typing import Dict, Any, List
+from urllib.parse import quote
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
@@ -15,35 +19,234 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from io import BytesIO
 
+# orjson parses bytes and serializes straight to bytes; fall back to stdlib json
+try:
+    import orjson
+
+    def _json_loads(body):
+        return orjson.loads(body)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_loads(body):
+        return json.loads(body)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# --- CACHED STYLES (built once at import, reused by every request) ---
+_STYLES = getSampleStyleSheet()
+
+# Custom styles (clinical, not playful)
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=18,
+    textColor=colors.HexColor('#1f2937'),
+    spaceAfter=6,
+    alignment=1  # Center
+)
+
+_SUBTITLE_STYLE = ParagraphStyle(
+    'SubtitleStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#6b7280'),
+    alignment=1,
+    spaceAfter=24
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=13,
+    textColor=colors.HexColor('#2563eb'),
+    spaceAfter=10,
+    spaceBefore=16,
+    fontName='Helvetica-Bold'
+)
+
+_BODY_STYLE = ParagraphStyle(
+    'BodyStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#374151'),
+    spaceAfter=8,
+    leading=14
+)
+
+_FINAL_WARNING_STYLE = ParagraphStyle(
+    'FinalWarning',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#374151'),
+    alignment=1,
+    fontName='Helvetica-Bold',
+    spaceAfter=12
+)
+
+# Risk level -> verdict box color
+_RISK_COLORS = {
+    'LOW': colors.HexColor('#10b981'),
+    'MODERATE': colors.HexColor('#f59e0b'),
+    'HIGH': colors.HexColor('#ef4444'),
+    'SEVERE': colors.HexColor('#991b1b')
+}
+
+# Static table style commands
+_METADATA_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#4b5563'))
+])
+
+# Verdict table commands; the risk-colored BOX/TEXTCOLOR are added per call
+_VERDICT_TABLE_COMMANDS = [
+    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f9fafb')),
+    ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (0, 0), 14),
+    ('FONTSIZE', (0, 1), (0, 1), 10),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('TOPPADDING', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12)
+]
+
+
+# --- STATIC REPORT TEXT (parsed once; copied into each report) ---
+_DISCLAIMER_TEXT = """
+<i>This assessment does not evaluate idea quality, market size, or likelihood of success. 
+It evaluates the risk that executing the required GTM will conflict with the founder's 
+working preferences.</i>
+"""
+
+_REGRET_TEXT = """
+This is the point at which founders with similar profiles historically report 
+avoidance, burnout, or abandonment.
+"""
+
+_DOES_NOT_SAY_TEXT = """
+This verdict does not say:
+• That the idea is bad
+• That the market is too small
+• That someone else could not succeed with this idea
+• That you should abandon the idea immediately
+
+It only states that this GTM path is statistically misaligned with how you work.
+"""
+
+_IMMUTABLE_TEXT = """
+<i>This report does not update. Re-running the assessment with different answers 
+constitutes a different idea.</i>
+"""
+
+_DISCLAIMER_PARA = Paragraph(_DISCLAIMER_TEXT, _BODY_STYLE)
+_REGRET_PARA = Paragraph(_REGRET_TEXT, _BODY_STYLE)
+_DOES_NOT_SAY_PARA = Paragraph(_DOES_NOT_SAY_TEXT, _BODY_STYLE)
+_IMMUTABLE_PARA = Paragraph(_IMMUTABLE_TEXT, _BODY_STYLE)
+_FINAL_WARNING_PARAS = (
+    Paragraph("Most founders ignore this signal.", _FINAL_WARNING_STYLE),
+    Paragraph("The cost is usually paid in time, not money.", _FINAL_WARNING_STYLE)
+)
+
+
+def _static(para: Paragraph) -> Paragraph:
+    """
+    Returns a shallow copy of a prebuilt Paragraph. The parsed markup is
+    shared; layout state set during a build stays on the copy.
+    """
+    return copy.copy(para)
+
+
+# --- WARM-UP (pay reportlab's one-time font/Platypus setup at cold start) ---
+try:
+    SimpleDocTemplate(BytesIO(), pagesize=letter, pageCompression=1).build(
+        [Paragraph("<b>x</b> <i>x</i> x", _BODY_STYLE)]
+    )
+except Exception as e:
+    print(f"✗ PDF warm-up failed: {str(e)}")
+
+
+# --- BULLET LIST HELPER ---
+_BULLET_COL_WIDTHS = [0.2*inch, 5.8*inch]
+
+# Body text without trailing space; row spacing comes from the table padding
+_BULLET_TEXT_STYLE = ParagraphStyle(
+    'BulletText',
+    parent=_BODY_STYLE,
+    spaceAfter=0
+)
+
+_BULLET_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), _BODY_STYLE.fontName),
+    ('FONTSIZE', (0, 0), (0, -1), _BODY_STYLE.fontSize),
+    ('LEADING', (0, 0), (0, -1), _BODY_STYLE.leading),
+    ('TEXTCOLOR', (0, 0), (0, -1), _BODY_STYLE.textColor),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+    ('TOPPADDING', (0, 0), (-1, -1), 0),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 2)
+])
+
+
+def bullet_table(items: List[str], bullet: str = "•") -> Table:
+    """
+    Renders a list of items as a single two-column Table (bullet | text).
+    Item text is escaped (rendered literally, no inline markup) and wrapped
+    by a Paragraph; rows may split across pages so long items still fit.
+    """
+    rows = [
+        [bullet, Paragraph(escape(str(item)), _BULLET_TEXT_STYLE)]
+        for item in items
+    ]
+    table = Table(rows, colWidths=_BULLET_COL_WIDTHS, hAlign='LEFT',
+                  splitInRow=1, spaceAfter=_BODY_STYLE.spaceAfter)
+    table.setStyle(_BULLET_TABLE_STYLE)
+    return table
+
 
 # --- PROFESSIONAL FOOTER FUNCTION ---
+# Footer constants (resolved once instead of on every page draw)
+_FOOTER_STROKE = colors.HexColor('#2563eb')
+_FOOTER_FILL = colors.HexColor('#666666')
+_FOOTER_RIGHT = letter[0] - 72
+_FOOTER_CX = letter[0] / 2
+
+
+def _draw_footer(canvas_obj, doc, footer_prefix: str):
+    """
+    Draws the professional footer on a page. footer_prefix is the
+    preformatted footer text up to (and including) "Page ".
+    """
+    canvas_obj.saveState()
+    
+    # Draw footer line
+    canvas_obj.setStrokeColor(_FOOTER_STROKE)
+    canvas_obj.setLineWidth(0.5)
+    canvas_obj.line(72, 50, _FOOTER_RIGHT, 50)
+    
+    # Draw footer text
+    canvas_obj.setFont('Helvetica', 8)
+    canvas_obj.setFillColor(_FOOTER_FILL)
+    canvas_obj.drawCentredString(_FOOTER_CX, 35, footer_prefix + str(doc.page))
+    
+    canvas_obj.restoreState()
+
+
 def create_footer_drawer(assessment_id: str):
     """
     Returns a function that draws the professional footer on each page.
+    The same callable is used for the first and later pages.
     """
-    def draw_footer(canvas_obj, doc):
-        canvas_obj.saveState()
-        
-        # Footer text
-        footer_text = f"Will I Hate This? — Founder–GTM Misery Risk Diagnostic | Assessment ID: {assessment_id} | Page {doc.page}"
-        
-        # Draw footer line
-        canvas_obj.setStrokeColor(colors.HexColor('#2563eb'))
-        canvas_obj.setLineWidth(0.5)
-        canvas_obj.line(72, 50, letter[0] - 72, 50)
-        
-        # Draw footer text
-        canvas_obj.setFont('Helvetica', 8)
-        canvas_obj.setFillColor(colors.HexColor('#666666'))
-        canvas_obj.drawCentredString(letter[0] / 2, 35, footer_text)
-        
-        canvas_obj.restoreState()
-    
-    return draw_footer
+    prefix = f"Will I Hate This? — Founder–GTM Misery Risk Diagnostic | Assessment ID: {assessment_id} | Page "
+    return partial(_draw_footer, footer_prefix=prefix)
 
 
 # --- PDF GENERATION ENGINE (CLINICAL DIAGNOSTIC FORMAT) ---
-def generate_verdict_pdf(
+def generate_verdict_pdf_bytes(
     assessment_id: str,
     timestamp: str,
     verdict: Dict[str, Any],
@@ -52,9 +255,9 @@ def generate_verdict_pdf(
     mismatch_flags: List[str],
     time_to_regret: str,
     risk_level: str
-) -> str:
+) -> bytes:
     """
-    Generates a clinical diagnostic report as a Base64-encoded PDF.
+    Generates a clinical diagnostic report as raw PDF bytes.
     Mirrors the on-screen verdict exactly.
     """
     buffer = BytesIO()
@@ -66,7 +269,8 @@ def generate_verdict_pdf(
         rightMargin=72, 
         leftMargin=72,
         topMargin=72, 
-        bottomMargin=60
+        bottomMargin=60,
+        pageCompression=1  # zlib content streams; smaller PDF and Base64 payload
     )
     
     # Set up the footer callback
@@ -74,49 +278,10 @@ def generate_verdict_pdf(
     
     # Container for content
     elements = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles (clinical, not playful)
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=colors.HexColor('#1f2937'),
-        spaceAfter=6,
-        alignment=1  # Center
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'SubtitleStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#6b7280'),
-        alignment=1,
-        spaceAfter=24
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=13,
-        textColor=colors.HexColor('#2563eb'),
-        spaceAfter=10,
-        spaceBefore=16,
-        fontName='Helvetica-Bold'
-    )
-    
-    body_style = ParagraphStyle(
-        'BodyStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#374151'),
-        spaceAfter=8,
-        leading=14
-    )
     
     # --- HEADER ---
-    elements.append(Paragraph("FOUNDER–GTM MISERY RISK DIAGNOSTIC", title_style))
-    elements.append(Paragraph("Will I Hate This?", subtitle_style))
+    elements.append(Paragraph("FOUNDER–GTM MISERY RISK DIAGNOSTIC", _TITLE_STYLE))
+    elements.append(Paragraph("Will I Hate This?", _SUBTITLE_STYLE))
     
     # --- METADATA ---
     metadata_data = [
@@ -126,172 +291,141 @@ def generate_verdict_pdf(
         ['Classification Integrity:', 'Deterministic']
     ]
     metadata_table = Table(metadata_data, colWidths=[2*inch, 4*inch])
-    metadata_table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 9),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#4b5563'))
-    ]))
+    metadata_table.setStyle(_METADATA_TABLE_STYLE)
     elements.append(metadata_table)
     elements.append(Spacer(1, 0.15*inch))
     
     # --- DISCLAIMER ---
-    disclaimer_text = """
-    <i>This assessment does not evaluate idea quality, market size, or likelihood of success. 
-    It evaluates the risk that executing the required GTM will conflict with the founder's 
-    working preferences.</i>
-    """
-    elements.append(Paragraph(disclaimer_text, body_style))
+    elements.append(_static(_DISCLAIMER_PARA))
     elements.append(Spacer(1, 0.25*inch))
     
     # --- VERDICT BOX ---
-    elements.append(Paragraph("VERDICT", heading_style))
+    elements.append(Paragraph("VERDICT", _HEADING_STYLE))
     
     # Determine risk color
-    risk_colors = {
-        'LOW': colors.HexColor('#10b981'),
-        'MODERATE': colors.HexColor('#f59e0b'),
-        'HIGH': colors.HexColor('#ef4444'),
-        'SEVERE': colors.HexColor('#991b1b')
-    }
-    risk_color = risk_colors.get(risk_level.upper(), colors.black)
+    risk_color = _RISK_COLORS.get(risk_level.upper(), colors.black)
     
     verdict_data = [
         [f"Misery Risk: {risk_level.upper()}"],
         ['Expected mismatch between GTM requirements and founder energy profile.']
     ]
     verdict_table = Table(verdict_data, colWidths=[6*inch])
-    verdict_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f9fafb')),
+    verdict_table.setStyle(TableStyle(_VERDICT_TABLE_COMMANDS + [
         ('BOX', (0, 0), (-1, -1), 2, risk_color),
-        ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (0, 0), 14),
-        ('FONTSIZE', (0, 1), (0, 1), 10),
-        ('TEXTCOLOR', (0, 0), (0, 0), risk_color),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12)
+        ('TEXTCOLOR', (0, 0), (0, 0), risk_color)
     ]))
     elements.append(verdict_table)
     elements.append(Spacer(1, 0.2*inch))
     
     # --- TIME-TO-REGRET ---
-    elements.append(Paragraph(f"Time-to-Regret: {time_to_regret}", heading_style))
-    regret_text = """
-    This is the point at which founders with similar profiles historically report 
-    avoidance, burnout, or abandonment.
-    """
-    elements.append(Paragraph(regret_text, body_style))
+    elements.append(Paragraph(f"Time-to-Regret: {time_to_regret}", _HEADING_STYLE))
+    elements.append(_static(_REGRET_PARA))
     elements.append(Spacer(1, 0.2*inch))
     
     # --- PRIMARY GTM SHAPE ---
-    elements.append(Paragraph("PRIMARY GTM SHAPE", heading_style))
-    elements.append(Paragraph(f"<b>{gtm_shape}</b>", body_style))
+    elements.append(Paragraph("PRIMARY GTM SHAPE", _HEADING_STYLE))
+    elements.append(Paragraph(f"<b>{gtm_shape}</b>", _BODY_STYLE))
     
     gtm_description = verdict.get('gtm_description', 'Classification description not available.')
-    elements.append(Paragraph(gtm_description, body_style))
+    elements.append(Paragraph(gtm_description, _BODY_STYLE))
     
     # Active Pressure Flags
     pressure_flags = verdict.get('pressure_flags', [])
     if pressure_flags:
         elements.append(Spacer(1, 0.1*inch))
-        elements.append(Paragraph("<b>Active Pressure Flags:</b>", body_style))
-        for flag in pressure_flags:
-            elements.append(Paragraph(f"• {flag}", body_style))
+        elements.append(Paragraph("<b>Active Pressure Flags:</b>", _BODY_STYLE))
+        elements.append(bullet_table(pressure_flags))
     
     elements.append(Spacer(1, 0.2*inch))
     
     # --- FOUNDER ENERGY PROFILE ---
-    elements.append(Paragraph("FOUNDER ENERGY PROFILE", heading_style))
+    elements.append(Paragraph("FOUNDER ENERGY PROFILE", _HEADING_STYLE))
     
     drivers = founder_profile.get('core_drivers', [])
     drains = founder_profile.get('core_drains', [])
     
     if drivers:
-        elements.append(Paragraph("<b>Core Drivers:</b>", body_style))
-        for driver in drivers:
-            elements.append(Paragraph(f"• {driver}", body_style))
+        elements.append(Paragraph("<b>Core Drivers:</b>", _BODY_STYLE))
+        elements.append(bullet_table(drivers))
     
     if drains:
         elements.append(Spacer(1, 0.1*inch))
-        elements.append(Paragraph("<b>Core Drains:</b>", body_style))
-        for drain in drains:
-            elements.append(Paragraph(f"• {drain}", body_style))
+        elements.append(Paragraph("<b>Core Drains:</b>", _BODY_STYLE))
+        elements.append(bullet_table(drains))
     
     elements.append(Spacer(1, 0.2*inch))
     
     # --- MISMATCH FLAGS ---
-    elements.append(Paragraph("MISMATCH FLAGS", heading_style))
+    elements.append(Paragraph("MISMATCH FLAGS", _HEADING_STYLE))
     
     if mismatch_flags:
-        for flag in mismatch_flags:
-            # Use ✗ instead of emoji (PDF-safe)
-            flag_text = f"✗ {flag}"
-            flag_para = Paragraph(flag_text, body_style)
-            elements.append(flag_para)
-            elements.append(Spacer(1, 0.05*inch))
+        # Use ✗ instead of emoji (PDF-safe)
+        elements.append(bullet_table(mismatch_flags, bullet="✗"))
     else:
-        elements.append(Paragraph("No critical mismatches detected.", body_style))
+        elements.append(Paragraph("No critical mismatches detected.", _BODY_STYLE))
     
     elements.append(Spacer(1, 0.2*inch))
     
     # --- WHY THIS VERDICT ---
-    elements.append(Paragraph("CLASSIFICATION BASIS", heading_style))
+    elements.append(Paragraph("CLASSIFICATION BASIS", _HEADING_STYLE))
     
     explanation = verdict.get('explanation', 'Classification basis not available.')
-    elements.append(Paragraph(explanation, body_style))
+    elements.append(Paragraph(explanation, _BODY_STYLE))
     
     elements.append(Spacer(1, 0.2*inch))
     
     # --- WHAT THIS VERDICT DOES NOT SAY ---
-    elements.append(Paragraph("WHAT THIS VERDICT DOES NOT SAY", heading_style))
-    
-    does_not_say = """
-    This verdict does not say:
-    • That the idea is bad
-    • That the market is too small
-    • That someone else could not succeed with this idea
-    • That you should abandon the idea immediately
+    elements.append(Paragraph("WHAT THIS VERDICT DOES NOT SAY", _HEADING_STYLE))
     
-    It only states that this GTM path is statistically misaligned with how you work.
-    """
-    elements.append(Paragraph(does_not_say, body_style))
+    elements.append(_static(_DOES_NOT_SAY_PARA))
     
     elements.append(Spacer(1, 0.3*inch))
     
     # --- FINAL LINE ---
-    final_warning = ParagraphStyle(
-        'FinalWarning',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#374151'),
-        alignment=1,
-        fontName='Helvetica-Bold',
-        spaceAfter=12
-    )
-    
-    elements.append(Paragraph("Most founders ignore this signal.", final_warning))
-    elements.append(Paragraph("The cost is usually paid in time, not money.", final_warning))
+    elements.extend(_static(para) for para in _FINAL_WARNING_PARAS)
     
     elements.append(Spacer(1, 0.2*inch))
     
     # --- IMMUTABILITY NOTICE ---
-    immutable_text = """
-    <i>This report does not update. Re-running the assessment with different answers 
-    constitutes a different idea.</i>
-    """
-    elements.append(Paragraph(immutable_text, body_style))
+    elements.append(_static(_IMMUTABLE_PARA))
     
     # Build PDF with footer
     doc.build(elements, onFirstPage=footer_func, onLaterPages=footer_func)
     
-    # Get PDF bytes and encode as base64
-    buffer.seek(0)
-    pdf_bytes = buffer.read()
-    return base64.b64encode(pdf_bytes).decode('utf-8')
+    return buffer.getvalue()
+
+
+def generate_verdict_pdf(
+    assessment_id: str,
+    timestamp: str,
+    verdict: Dict[str, Any],
+    gtm_shape: str,
+    founder_profile: Dict[str, Any],
+    mismatch_flags: List[str],
+    time_to_regret: str,
+    risk_level: str
+) -> bytes:
+    """
+    Generates a clinical diagnostic report as a Base64-encoded PDF.
+    Returns the Base64 output as ASCII bytes (not str), so callers can embed
+    it in a response without a decode/encode round-trip.
+    """
+    return base64.b64encode(generate_verdict_pdf_bytes(
+        assessment_id=assessment_id,
+        timestamp=timestamp,
+        verdict=verdict,
+        gtm_shape=gtm_shape,
+        founder_profile=founder_profile,
+        mismatch_flags=mismatch_flags,
+        time_to_regret=time_to_regret,
+        risk_level=risk_level
+    ))
 
 
 # --- HTTP HANDLER (Vercel Serverless Function Format) ---
+_MAX_BODY_BYTES = 1024 * 1024  # 1 MB; real payloads are a few KB
+
+
 class handler(BaseHTTPRequestHandler):
     
     def do_OPTIONS(self):
@@ -305,9 +439,38 @@ class handler(BaseHTTPRequestHandler):
     def do_POST(self):
         """Generate PDF diagnostic report"""
         try:
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            data = json.loads(body)
+            # Reject non-JSON bodies before reading anything
+            content_type = self.headers.get('Content-Type', '')
+            if 'application/json' not in content_type.lower():
+                self.send_response(415)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(_json_dumps({'error': 'Content-Type must be application/json'}))
+                return
+
+            # Cap the body size so oversized payloads are never read or parsed
+            try:
+                content_length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                content_length = -1
+            if content_length < 0:
+                self.send_response(400)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(_json_dumps({'error': 'Invalid Content-Length'}))
+                return
+            if content_length > _MAX_BODY_BYTES:
+                self.send_response(413)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(_json_dumps({'error': 'Request body too large'}))
+                return
+
+            # Both json parsers accept raw bytes; no separate UTF-8 decode pass
+            data = _json_loads(self.rfile.read(content_length))
 
             assessment_id = data.get('assessment_id')
             
@@ -316,7 +479,7 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Content-Type', 'application/json')
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
-                self.wfile.write(json.dumps({'error': 'assessment_id is required'}).encode())
+                self.wfile.write(_json_dumps({'error': 'assessment_id is required'}))
                 return
 
             # Generate real-time UTC timestamp
@@ -337,12 +500,11 @@ class handler(BaseHTTPRequestHandler):
                 self.send_header('Access-Control-Allow-Origin', '*')
                 self.end_headers()
                 error_response = {'error': 'Verdict data missing. Cannot generate report.'}
-                self.wfile.write(json.dumps(error_response).encode())
+                self.wfile.write(_json_dumps(error_response))
                 print(f"✗ PDF generation failed for assessment {assessment_id}: Missing verdict data")
                 return
 
-            # Generate PDF
-            pdf_content_base64 = generate_verdict_pdf(
+            report_args = dict(
                 assessment_id=assessment_id,
                 timestamp=timestamp,
                 verdict=verdict,
@@ -352,6 +514,36 @@ class handler(BaseHTTPRequestHandler):
                 time_to_regret=time_to_regret,
                 risk_level=risk_level
             )
+            filename = f"WHT-Diagnostic-Report-{assessment_id[:8]}.pdf"
+
+            # Raw PDF for clients that ask for it (no base64/JSON wrapping)
+            if 'application/pdf' in self.headers.get('Accept', ''):
+                pdf_bytes = generate_verdict_pdf_bytes(**report_args)
+                # assessment_id is client-supplied: the plain filename is ASCII
+                # only, the full name goes in an RFC 5987 filename* parameter
+                ascii_filename = ''.join(
+                    c for c in filename if c.isascii() and c.isprintable() and c not in '"\\'
+                )
+                # Build every header up front so nothing can fail after the status line
+                headers = [
+                    ('Content-Type', 'application/pdf'),
+                    ('Content-Disposition',
+                     f'attachment; filename="{ascii_filename}"; '
+                     f"filename*=UTF-8''{quote(filename, safe='')}"),
+                    ('Content-Length', str(len(pdf_bytes))),
+                    ('Access-Control-Allow-Origin', '*'),
+                    ('Access-Control-Expose-Headers', 'Content-Disposition')
+                ]
+                self.send_response(200)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(pdf_bytes)
+                print(f"✓ PDF generated successfully for assessment: {assessment_id}")
+                return
+
+            # Default: Base64 PDF in a JSON envelope (backwards compatible)
+            pdf_content_base64 = generate_verdict_pdf(**report_args)
             
             # Return response
             self.send_response(200)
@@ -359,15 +551,13 @@ class handler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             
-            response_data = {
-                'success': True,
-                'pdfAttachmentData': {
-                    'filename': f"WHT-Diagnostic-Report-{assessment_id[:8]}.pdf",
-                    'content': pdf_content_base64
-                }
-            }
-            
-            self.wfile.write(json.dumps(response_data).encode())
+            # Assemble the JSON envelope as bytes so the Base64 payload is
+            # never decoded to str and re-encoded (it is ASCII, safe to embed)
+            response_body = (
+                b'{"success": true, "pdfAttachmentData": {"filename": %s, "content": "%s"}}'
+                % (_json_dumps(filename), pdf_content_base64)
+            )
+            self.wfile.write(response_body)
             print(f"✓ PDF generated successfully for assessment: {assessment_id}")
 
         except Exception as e:
@@ -376,5 +566,5 @@ class handler(BaseHTTPRequestHandler):
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
             error_response = {'error': f'PDF Generation Failed: {str(e)}'}
-            self.wfile.write(json.dumps(error_response).encode())
+            self.wfile.write(_json_dumps(error_response))
             print(f"✗ PDF generation error: {str(e)}")